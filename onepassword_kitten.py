@@ -1,8 +1,28 @@
 #!/usr/bin/env python3
 
+import functools
+import os
+import shutil
+import stat
 import subprocess
-import json
-from typing import Optional, List, Dict
+import tempfile
+import threading
+import time
+from typing import Optional, List, Dict, Tuple
+
+# Use orjson for faster parsing of large item lists when available
+try:
+    import orjson as _json
+except ImportError:
+    import json as _json
+
+# Use rapidfuzz for in-process matching on small vaults when available
+try:
+    from rapidfuzz import fuzz, process as rapidfuzz_process, utils as rapidfuzz_utils
+except ImportError:
+    fuzz = None
+    rapidfuzz_process = None
+    rapidfuzz_utils = None
 
 # Import kitty modules only when running as a kitten
 try:
@@ -16,19 +36,172 @@ except ImportError:
 # fzf binary path - will be set during installation
 FZF_BINARY_PATH = None
 
+# Vaults smaller than this are matched in-process instead of spawning fzf
+RAPIDFUZZ_ITEM_THRESHOLD = 50
+# Matches scoring below this are never offered, and at most this many are listed
+RAPIDFUZZ_SCORE_CUTOFF = 60
+RAPIDFUZZ_MATCH_LIMIT = 5
+
+# Absolute binary paths, resolved once. Spawning by absolute path with
+# close_fds=False lets subprocess use the faster posix_spawn() path.
+# (Python's own descriptors are non-inheritable, so nothing extra leaks.)
+OP_BINARY_PATH = shutil.which("op") or "op"
+FZF_COMMAND = FZF_BINARY_PATH or shutil.which("fzf") or "fzf"
+
+# Environment for op calls; OP_CACHE lets op reuse account metadata between runs
+_OP_ENV = {**os.environ, "OP_CACHE": "true"}
+
+# Optional 1Password Connect server, used to fetch passwords without starting op.
+# Kitten-specific names: op itself switches to Connect mode when it sees OP_CONNECT_*.
+OP_CONNECT_HOST = os.environ.get("KITTY_OP_CONNECT_HOST")
+OP_CONNECT_TOKEN = os.environ.get("KITTY_OP_CONNECT_TOKEN")
+
+# Base op argument templates
+_OP_WHOAMI_ARGS = ("whoami", "--format=json")
+_OP_SIGNIN_ARGS = ("signin", "--raw")
+_OP_LIST_ARGS = ("item", "list", "--format=json")
+
+# Cache files live in the per-user runtime dir ($XDG_RUNTIME_DIR on Linux, $TMPDIR on macOS)
+CACHE_DIR = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+
+# Cached session tokens are reused for up to 25 minutes (1Password's default session lifetime)
+SESSION_CACHE_TTL = 1500
+SESSION_CACHE_FILE = os.path.join(CACHE_DIR, "kitty-op-session")
+
+# Item lists are reused for 60 seconds so repeated invocations skip op item list
+ITEMS_CACHE_TTL = 60
+ITEMS_CACHE_FILE = os.path.join(CACHE_DIR, "kitty-op-items.json")
+
+@functools.lru_cache(maxsize=1)
 def has_fzf() -> bool:
     """Check if fzf is available for fuzzy search"""
-    result = subprocess.run(["which", "fzf"], capture_output=True)
-    return result.returncode == 0
+    return shutil.which("fzf") is not None
+
+
+def _op_args(session_token: Optional[str], *args: str) -> List[str]:
+    """Build an op command line, passing the session token unless using app integration"""
+    cmd = [OP_BINARY_PATH, *args]
+    if session_token and session_token != "APP_INTEGRATION":
+        cmd += ["--session", session_token]
+    return cmd
+
+
+def _read_cache_file(path: str, ttl: float) -> Optional[bytes]:
+    """Return the contents of a cache file if it exists and is younger than ttl seconds"""
+    try:
+        # O_NONBLOCK keeps a FIFO planted at path from blocking the open
+        fd = os.open(path, os.O_RDONLY | os.O_NOFOLLOW | os.O_NONBLOCK)
+    except OSError:
+        return None
+    try:
+        st = os.fstat(fd)
+        # Only trust regular files we own that nobody else can read or write
+        if not stat.S_ISREG(st.st_mode) or st.st_uid != os.getuid() or st.st_mode & 0o077:
+            return None
+        if time.time() - st.st_mtime >= ttl:
+            return None
+        return os.read(fd, st.st_size)
+    finally:
+        os.close(fd)
+
+
+def _write_cache_file(path: str, data: bytes) -> None:
+    """Write a cache file only readable by the current user"""
+    # Create a fresh private file and rename it into place, so a pre-existing
+    # file or symlink at path is never written through
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        fd = os.open(tmp_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY | os.O_NOFOLLOW, 0o600)
+    except OSError:
+        return
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except OSError:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+
+def _load_cached_token() -> Optional[str]:
+    """Return the cached session token if it exists and has not expired"""
+    data = _read_cache_file(SESSION_CACHE_FILE, SESSION_CACHE_TTL)
+    if data is None:
+        return None
+    return data.decode().strip() or None
+
+
+def _store_cached_token(session_token: str) -> None:
+    """Persist the session token in a file only readable by the current user"""
+    _write_cache_file(SESSION_CACHE_FILE, session_token.encode())
+
+
+def _load_cached_items() -> Tuple[Optional[str], Optional[List[Dict]]]:
+    """Return the account UUID and item list from the cache if it has not expired"""
+    data = _read_cache_file(ITEMS_CACHE_FILE, ITEMS_CACHE_TTL)
+    if data is None:
+        return None, None
+    try:
+        cache = _json.loads(data)
+    except ValueError:
+        return None, None
+    if not cache.get("account") or not cache.get("items"):
+        return None, None
+    return cache["account"], cache["items"]
+
+
+def _store_cached_items(account_uuid: Optional[str], items: List[Dict]) -> None:
+    """Persist the fields of each item needed for selection and password lookup"""
+    if not account_uuid:
+        return
+    slim_items = [{"id": item["id"],
+                   "title": item.get("title", "Untitled"),
+                   "category": item.get("category", "Unknown"),
+                   "urls": item.get("urls", [])[:1],
+                   "vault": {"id": item.get("vault", {}).get("id")}}
+                  for item in items]
+    data = _json.dumps({"account": account_uuid, "items": slim_items})
+    _write_cache_file(ITEMS_CACHE_FILE, data.encode() if isinstance(data, str) else data)
+
+
+def _clear_cached_items() -> None:
+    """Remove the cached item list"""
+    try:
+        os.remove(ITEMS_CACHE_FILE)
+    except OSError:
+        pass
+
+
+def _op_whoami(session_token: str) -> Optional[Dict]:
+    """Return account details if a session token is still valid, otherwise None"""
+    # A timeout propagates as subprocess.TimeoutExpired: a slow op is not a rejected token
+    result = subprocess.run(_op_args(session_token, *_OP_WHOAMI_ARGS),
+                          capture_output=True, timeout=2, env=_OP_ENV, close_fds=False)
+    if result.returncode != 0:
+        return None
+    try:
+        return _json.loads(result.stdout)
+    except ValueError:
+        return {}
 
 
 def authenticate() -> Optional[str]:
     """Authenticate with 1Password and return session token"""
+    session_token = _signin()
+    if session_token and session_token != "APP_INTEGRATION":
+        _store_cached_token(session_token)
+    return session_token
+
+
+def _signin() -> Optional[str]:
+    """Sign in to 1Password and return session token"""
     # Try to authenticate
     try:
         # First try biometric unlock if available
-        result = subprocess.run(["op", "signin", "--raw"], 
-                              capture_output=True, text=True, timeout=30)
+        result = subprocess.run(_op_args(None, *_OP_SIGNIN_ARGS), 
+                              capture_output=True, text=True, timeout=30, env=_OP_ENV, close_fds=False)
         if result.returncode == 0:
             session_token = result.stdout.strip()
             # If we got a session token, return it
@@ -44,9 +217,11 @@ def authenticate() -> Optional[str]:
     try:
         print("Please authenticate with 1Password...")
         # Run interactive signin with --raw, allow stdin but capture stdout
-        result = subprocess.run(["op", "signin", "--raw"], 
+        result = subprocess.run(_op_args(None, *_OP_SIGNIN_ARGS), 
                               stdout=subprocess.PIPE, 
-                              text=True)
+                              text=True,
+                              env=_OP_ENV,
+                              close_fds=False)
         if result.returncode == 0:
             session_token = result.stdout.strip()
             if session_token:
@@ -60,95 +235,183 @@ def authenticate() -> Optional[str]:
 
 def get_1password_items(session_token: str, query: str = "") -> List[Dict]:
     """Get items from 1Password with session token"""
+    return _collect_items(_start_item_list(session_token), query)
+
+def _start_item_list(session_token: str) -> Optional[subprocess.Popen]:
+    """Start op item list in the background, returning None if op cannot be run"""
     try:
-        # Build command based on whether we have app integration or session token
-        if session_token == "APP_INTEGRATION":
-            cmd = ["op", "item", "list", "--format=json"]
-        else:
-            cmd = ["op", "item", "list", "--format=json", "--session", session_token]
-        
-        result = subprocess.run(cmd, capture_output=True, text=True, check=False)
+        return subprocess.Popen(_op_args(session_token, *_OP_LIST_ARGS),
+                                stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                                env=_OP_ENV, close_fds=False)
+    except OSError:
+        return None
+
+def _collect_items(process: Optional[subprocess.Popen], query: str = "") -> List[Dict]:
+    """Wait for a started op item list and return its items, optionally filtered by query"""
+    if process is None:
+        return []
+    try:
+        # Keep stdout as bytes, both parsers accept it directly
+        stdout, _ = process.communicate()
         
-        if result.returncode != 0:
+        if process.returncode != 0:
             return []
         
-        items = json.loads(result.stdout)
+        items = _json.loads(stdout)
         
         # Filter by query if provided
         if query:
-            query_lower = query.lower()
-            filtered_items = []
-            for item in items:
-                title = item.get("title", "").lower()
-                tags = " ".join(item.get("tags", [])).lower()
-                category = item.get("category", "").lower()
-                
-                if (query_lower in title or 
-                    query_lower in tags or 
-                    query_lower in category):
-                    filtered_items.append(item)
-            return filtered_items
+            query_folded = query.casefold()
+            # Match against title, tags and category in one pass; the unit
+            # separator keeps a match from spanning two fields
+            return [item for item in items
+                    if query_folded in "\x1f".join((item.get("title", ""),
+                                                     " ".join(item.get("tags", ())),
+                                                     item.get("category", ""))).casefold()]
         
         return items
-    except (json.JSONDecodeError, Exception):
+    except (ValueError, Exception):
         return []
 
-def get_password_from_1password(session_token: str, item_id: str) -> Optional[str]:
+def _get_password_from_connect(vault_id: str, item_id: str) -> Optional[str]:
+    """Retrieve password for an item from a 1Password Connect server"""
+    import http.client
+    from urllib.parse import urlsplit
+    
+    url = urlsplit(OP_CONNECT_HOST if "://" in OP_CONNECT_HOST else f"http://{OP_CONNECT_HOST}")
+    connection_class = http.client.HTTPSConnection if url.scheme == "https" else http.client.HTTPConnection
+    try:
+        connection = connection_class(url.netloc, timeout=5)
+        try:
+            connection.request("GET", f"{url.path.rstrip('/')}/v1/vaults/{vault_id}/items/{item_id}",
+                               headers={"Authorization": f"Bearer {OP_CONNECT_TOKEN}"})
+            response = connection.getresponse()
+            if response.status != 200:
+                return None
+            item = _json.loads(response.read())
+        finally:
+            connection.close()
+    except (OSError, http.client.HTTPException, ValueError):
+        return None
+    
+    for field in item.get("fields", []):
+        if field.get("purpose") == "PASSWORD" and field.get("value"):
+            return field["value"]
+    return None
+
+def get_password_from_1password(session_token: str, item_id: str, vault_id: Optional[str] = None) -> Optional[str]:
     """Retrieve password from 1Password for a specific item"""
+    # Ask a Connect server first if one is configured, avoiding op startup entirely
+    if vault_id and OP_CONNECT_HOST and OP_CONNECT_TOKEN:
+        password = _get_password_from_connect(vault_id, item_id)
+        if password:
+            return password
+    
+    # Read the field directly by secret reference, skipping the item metadata round-trip
+    if vault_id:
+        cmd = _op_args(session_token, "read", f"op://{vault_id}/{item_id}/password")
+        result = subprocess.run(cmd, capture_output=True, text=True, check=False, env=_OP_ENV, close_fds=False)
+        if result.returncode == 0:
+            return result.stdout.strip()
+    
+    # Fall back to item get (older op versions)
     try:
-        # Build command based on whether we have app integration or session token
-        if session_token == "APP_INTEGRATION":
-            cmd = ["op", "item", "get", item_id, "--fields=password"]
-        else:
-            cmd = ["op", "item", "get", item_id, "--fields=password", "--session", session_token]
-        
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+        cmd = _op_args(session_token, "item", "get", item_id, "--fields=password")
+        result = subprocess.run(cmd, capture_output=True, text=True, check=True, env=_OP_ENV, close_fds=False)
         return result.stdout.strip()
     except subprocess.CalledProcessError:
         return None
 
 def fuzzy_select_item(items: List[Dict]) -> Optional[Dict]:
-    """Use fzf for fuzzy selection of items"""
+    """Fuzzy select an item, in-process with rapidfuzz for small vaults, otherwise with fzf"""
     if not items:
         return None
     
+    if rapidfuzz_process is not None and len(items) < RAPIDFUZZ_ITEM_THRESHOLD:
+        return fuzzy_select_with_rapidfuzz(items)
+    
     return fuzzy_select_with_fzf(items)
 
+def _format_item(item: Dict) -> str:
+    """Build the display line shown for an item in the selector"""
+    urls = item.get("urls")
+    url = urls[0].get("href", "") if urls else ""
+    display_line = f"{item.get('title', 'Untitled')} ({item.get('category', 'Unknown')})"
+    if url:
+        display_line += f" - {url}"
+    return display_line
+
+def fuzzy_select_with_rapidfuzz(items: List[Dict]) -> Optional[Dict]:
+    """Prompt for a query and pick the best matching item with rapidfuzz"""
+    try:
+        query = input("Search 1Password items: ").strip()
+    except (EOFError, KeyboardInterrupt):
+        return None
+    
+    if not query:
+        return None
+    
+    matches = rapidfuzz_process.extract(query, [_format_item(item) for item in items],
+                                        scorer=fuzz.WRatio, processor=rapidfuzz_utils.default_process,
+                                        limit=RAPIDFUZZ_MATCH_LIMIT,
+                                        score_cutoff=RAPIDFUZZ_SCORE_CUTOFF)
+    if not matches:
+        print("No matching items")
+        return None
+    
+    # Never paste a guess: the user has to pick one of the matches explicitly
+    for number, (display_line, _, _) in enumerate(matches, 1):
+        print(f"{number}. {display_line}")
+    try:
+        choice = input("Select item number (Enter to cancel): ").strip()
+    except (EOFError, KeyboardInterrupt):
+        return None
+    
+    if not choice.isdigit() or not 1 <= int(choice) <= len(matches):
+        return None
+    return items[matches[int(choice) - 1][2]]
+
+def _feed_fzf(stdin, items: List[Dict]) -> None:
+    """Write items to fzf's stdin one line at a time, then close it"""
+    try:
+        for i, item in enumerate(items):
+            stdin.write(f"{i}:{_format_item(item)}\n".encode())
+    except BrokenPipeError:
+        # fzf exited before reading everything (selection made or cancelled)
+        pass
+    finally:
+        try:
+            stdin.close()
+        except BrokenPipeError:
+            pass
+
 def fuzzy_select_with_fzf(items: List[Dict]) -> Optional[Dict]:
     """Use fzf for interactive fuzzy selection"""
-    # Prepare items for fzf
-    fzf_input = []
-    for i, item in enumerate(items):
-        title = item.get("title", "Untitled")
-        category = item.get("category", "Unknown")
-        url = item.get("urls", [{}])[0].get("href", "") if item.get("urls") else ""
-        
-        display_line = f"{title} ({category})"
-        if url:
-            display_line += f" - {url}"
-        
-        fzf_input.append(f"{i}:{display_line}")
-    
     try:
-        # Determine fzf command
-        fzf_cmd = FZF_BINARY_PATH if FZF_BINARY_PATH else "fzf"
-        
-        # Use subprocess.Popen to control stdin/stdout/stderr separately
-        fzf_process = subprocess.Popen(
-            [fzf_cmd, "--prompt=Select 1Password item: ", "--height=40%", "--reverse"],
+        # Use subprocess.Popen to control stdin/stdout/stderr separately;
+        # the with block closes the pipes once fzf has exited
+        with subprocess.Popen(
+            [FZF_COMMAND, "--prompt=Select 1Password item: ", "--height=40%", "--reverse"],
             stdin=subprocess.PIPE,
             stdout=subprocess.PIPE,
             stderr=None,  # Let stderr go to terminal
-            text=True
-        )
+            bufsize=-1,  # Buffered bytes; only the short selected line gets parsed
+            close_fds=False
+        ) as fzf_process:
+            # Stream items from a background thread so fzf can start indexing
+            # before the whole list has been formatted
+            feeder = threading.Thread(target=_feed_fzf, args=(fzf_process.stdin, items), daemon=True)
+            feeder.start()
+            stdout = fzf_process.stdout.read()
+            fzf_process.wait()
+            # fzf is gone, so the feeder finishes (or hits a broken pipe) right away
+            feeder.join()
         
-        stdout, _ = fzf_process.communicate("\n".join(fzf_input))
-        
-        if fzf_process.returncode == 0 and stdout.strip():
-            # Extract index from fzf output
-            selected_line = stdout.strip()
-            index = int(selected_line.split(":", 1)[0])
-            return items[index]
+        if fzf_process.returncode == 0:
+            # Extract index prefix from fzf output
+            colon = stdout.find(b":")
+            if colon > 0:
+                return items[int(stdout[:colon])]
     except (subprocess.CalledProcessError, ValueError, IndexError):
         pass
     
@@ -157,14 +420,60 @@ def fuzzy_select_with_fzf(items: List[Dict]) -> Optional[Dict]:
 def main(args: List[str]) -> str:
     """Main entry point for the kitten"""
     # Authenticate
-    session_token = authenticate()
-    if not session_token:
-        return "ERROR: Authentication failed"
+    items = None
+    items_from_cache = False
+    session_token = _load_cached_token()
+    if session_token:
+        cached_account, cached_items = _load_cached_items()
+        # Verify the cached token while speculatively listing items with it,
+        # unless a fresh item cache means the list is probably not needed
+        lister = None if cached_items else _start_item_list(session_token)
+        
+        try:
+            whoami = _op_whoami(session_token)
+        except subprocess.TimeoutExpired:
+            # op is slow rather than the token rejected; a successful list
+            # proves the token valid, so let the list decide
+            whoami = {}
+        
+        if whoami is None:
+            # Rejected token: stop the speculative list instead of waiting for it
+            if lister:
+                lister.terminate()
+                lister.wait()
+                lister.stdout.close()
+            session_token = None
+        else:
+            account_uuid = whoami.get("account_uuid")
+            if cached_items and account_uuid == cached_account:
+                items = cached_items
+                items_from_cache = True
+            else:
+                items = _collect_items(lister or _start_item_list(session_token))
+                if items:
+                    _store_cached_items(account_uuid, items)
+                elif not whoami:
+                    # Unverified token and the list failed too: sign in again
+                    session_token = None
     
-    # Get all items from 1Password (no initial filtering)
-    items = get_1password_items(session_token)
+    if not session_token:
+        # The cached token (if any) was already checked above
+        session_token = authenticate()
+        if not session_token:
+            return "ERROR: Authentication failed"
+        
+        # Get all items from 1Password (no initial filtering)
+        items = get_1password_items(session_token)
+        if items and session_token != "APP_INTEGRATION":
+            try:
+                whoami = _op_whoami(session_token)
+            except subprocess.TimeoutExpired:
+                whoami = None
+            if whoami:
+                _store_cached_items(whoami.get("account_uuid"), items)
     
     if not items:
+        _clear_cached_items()
         return "ERROR: No items found in 1Password"
     
     # Let user select an item with fzf (user can type to filter)
@@ -173,10 +482,14 @@ def main(args: List[str]) -> str:
         return "CANCELLED"
     
     # Get the password
-    password = get_password_from_1password(session_token, selected_item["id"])
+    vault_id = selected_item.get("vault", {}).get("id")
+    password = get_password_from_1password(session_token, selected_item["id"], vault_id)
     if password:
         return password
     else:
+        if items_from_cache:
+            # The cached item may have been moved or deleted
+            _clear_cached_items()
         return "ERROR: Could not retrieve password"
 
 def handle_result(args: List[str], answer: str, target_window_id: int, boss: Boss) -> None: